@@ -229,8 +229,7 @@ def compile(bench_paths, **args):
         if os.path.isdir(path):
             path = path + '/*.toml'
 
-        for path in glob.glob(path):
-            paths.append(path)
+        paths.extend(glob.glob(path))
 
     if not paths:
         print('no bench suites found in %r?' % bench_paths)
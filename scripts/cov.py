@@ -14,19 +14,28 @@
 
 import collections as co
 import csv
+import functools as ft
 import itertools as it
 import json
 import math as m
+import multiprocessing as mp
+import operator as op
 import os
 import re
 import shlex
 import subprocess as sp
+import sys
 
 # TODO use explode_asserts to avoid counting assert branches?
 # TODO use dwarf=info to find functions for inline functions?
 
 GCOV_PATH = ['gcov']
 
+# patterns for +-∞ and +-inf, compiled once since these are checked for every
+# non-integer we parse
+POS_INF_PATTERN = re.compile('^\s*\+?\s*(?:∞|inf)\s*$')
+NEG_INF_PATTERN = re.compile('^\s*-\s*(?:∞|inf)\s*$')
+
 
 # integer fields
 class Int(co.namedtuple('Int', 'x')):
@@ -38,10 +47,13 @@ class Int(co.namedtuple('Int', 'x')):
             try:
                 x = int(x, 0)
             except ValueError:
-                # also accept +-∞ and +-inf
-                if re.match('^\s*\+?\s*(?:∞|inf)\s*$', x):
+                # also accept +-∞ and +-inf, a cheap suffix check lets
+                # most bad input skip the regex engine entirely
+                if not x.rstrip().endswith(('∞', 'inf')):
+                    raise
+                elif POS_INF_PATTERN.match(x):
                     x = m.inf
-                elif re.match('^\s*-\s*(?:∞|inf)\s*$', x):
+                elif NEG_INF_PATTERN.match(x):
                     x = -m.inf
                 else:
                     raise
@@ -192,12 +204,14 @@ class CovResult(co.namedtuple('CovResult', [
             Int(calls), Int(hits), Frac(funcs), Frac(lines), Frac(branches))
 
     def __add__(self, other):
-        return CovResult(self.file, self.function, self.line,
+        # both sides are already typed, so skip __new__'s coercion, this is
+        # called for every conflict when folding
+        return CovResult._make((self.file, self.function, self.line,
             max(self.calls, other.calls),
             max(self.hits, other.hits),
             self.funcs + other.funcs,
             self.lines + other.lines,
-            self.branches + other.branches)
+            self.branches + other.branches))
 
 
 def openio(path, mode='r', buffering=-1):
@@ -210,91 +224,155 @@ def openio(path, mode='r', buffering=-1):
     else:
         return open(path, mode, buffering)
 
-def collect(gcda_paths, *,
+# gcov reports the same sources (headers especially) for every gcda file,
+# so cache how we filter/simplify each one
+@ft.lru_cache(maxsize=None)
+def find_source(file, sources=None, everything=False):
+    cwd = os.getcwd()
+    path = os.path.abspath(file)
+    in_cwd = os.path.commonpath([cwd, path]) == cwd
+
+    # ignore filtered sources
+    if sources is not None:
+        if path not in sources:
+            return None
+    else:
+        # default to only cwd
+        if not everything and not in_cwd:
+            return None
+
+    # simplify path
+    if in_cwd:
+        return os.path.relpath(path, cwd)
+    else:
+        return path
+
+def collect_job(path, *,
         gcov_path=GCOV_PATH,
         sources=None,
         everything=False,
         **args):
-    results = []
-    for path in gcda_paths:
-        # get coverage info through gcov's json output
-        # note, gcov-path may contain extra args
-        cmd = GCOV_PATH + ['-b', '-t', '--json-format', path]
-        if args.get('verbose'):
-            print(' '.join(shlex.quote(c) for c in cmd))
-        proc = sp.Popen(cmd,
-            stdout=sp.PIPE,
-            stderr=sp.PIPE if not args.get('verbose') else None,
-            universal_newlines=True,
-            errors='replace',
-            close_fds=False)
-        data = json.load(proc.stdout)
-        proc.wait()
-        if proc.returncode != 0:
-            if not args.get('verbose'):
-                for line in proc.stderr:
-                    sys.stdout.write(line)
-            sys.exit(-1)
+    # get coverage info through gcov's json output
+    # note, gcov-path may contain extra args
+    cmd = gcov_path + ['-b', '-t', '--json-format', path]
+    if args.get('verbose'):
+        print(' '.join(shlex.quote(c) for c in cmd))
+    proc = sp.Popen(cmd,
+        stdout=sp.PIPE,
+        stderr=sp.PIPE if not args.get('verbose') else None,
+        universal_newlines=True,
+        errors='replace',
+        close_fds=False)
+    # read gcov's output in one go, this also avoids deadlocking if gcov
+    # fills up its stderr pipe while we're waiting on stdout
+    stdout, stderr = proc.communicate()
+    if proc.returncode != 0:
+        if not args.get('verbose'):
+            sys.stdout.write(stderr)
+        # leave exiting to our caller, we may be in a worker process
+        return None
+    data = json.loads(stdout)
+
+    # these are immutable, so share them between results, most results only
+    # differ in a couple of fields
+    zero = Int(0)
+    none = Frac(0, 0)
+    hit, miss = Frac(1, 1), Frac(0, 1)
 
-        # collect line/branch coverage
-        for file in data['files']:
-            # ignore filtered sources
-            if sources is not None:
-                if not any(
-                        os.path.abspath(file['file']) == os.path.abspath(s)
-                        for s in sources):
+    results = []
+    # collect line/branch coverage
+    for file in data['files']:
+        file_name = find_source(file['file'], sources, everything)
+        if file_name is None:
+            continue
+
+        for func in file['functions']:
+            func_name = func.get('name', '(inlined)')
+            # discard internal functions (this includes injected test cases)
+            if not everything:
+                if func_name.startswith('__'):
                     continue
-            else:
-                # default to only cwd
-                if not everything and not os.path.commonpath([
-                        os.getcwd(),
-                        os.path.abspath(file['file'])]) == os.getcwd():
+
+            # go ahead and add functions, later folding will merge this if
+            # there are other hits on this line
+            #
+            # note gcov's json is already typed, so we can skip
+            # CovResult's string coercion here
+            results.append(CovResult._make((
+                file_name, sys.intern(func_name), func['start_line'],
+                Int(func['execution_count']), zero,
+                hit if func['execution_count'] > 0 else miss,
+                none,
+                none)))
+
+        for line in file['lines']:
+            func_name = line.get('function_name', '(inlined)')
+            # discard internal function (this includes injected test cases)
+            if not everything:
+                if func_name.startswith('__'):
                     continue
 
-            # simplify path
-            if os.path.commonpath([
-                    os.getcwd(),
-                    os.path.abspath(file['file'])]) == os.getcwd():
-                file_name = os.path.relpath(file['file'])
-            else:
-                file_name = os.path.abspath(file['file'])
+            # go ahead and add lines, later folding will merge this if
+            # there are other hits on this line
+            #
+            # note most lines have no branches, so don't bother counting
+            results.append(CovResult._make((
+                file_name, sys.intern(func_name), line['line_number'],
+                zero, Int(line['count']),
+                none,
+                hit if line['count'] > 0 else miss,
+                Frac(
+                    sum(1 if branch['count'] > 0 else 0
+                        for branch in line['branches']),
+                    len(line['branches']))
+                    if line['branches'] else none)))
 
-            for func in file['functions']:
-                func_name = func.get('name', '(inlined)')
-                # discard internal functions (this includes injected test cases)
-                if not everything:
-                    if func_name.startswith('__'):
-                        continue
+    return results
 
-                # go ahead and add functions, later folding will merge this if
-                # there are other hits on this line
-                results.append(CovResult(
-                    file_name, func_name, func['start_line'],
-                    func['execution_count'], 0,
-                    Frac(1 if func['execution_count'] > 0 else 0, 1),
-                    0,
-                    0))
-
-            for line in file['lines']:
-                func_name = line.get('function_name', '(inlined)')
-                # discard internal function (this includes injected test cases)
-                if not everything:
-                    if func_name.startswith('__'):
-                        continue
+def starapply(args):
+    f, args, kwargs = args
+    return f(*args, **kwargs)
 
-                # go ahead and add lines, later folding will merge this if
-                # there are other hits on this line
-                results.append(CovResult(
-                    file_name, func_name, line['line_number'],
-                    0, line['count'],
-                    0,
-                    Frac(1 if line['count'] > 0 else 0, 1),
-                    Frac(
-                        sum(1 if branch['count'] > 0 else 0
-                            for branch in line['branches']),
-                        len(line['branches']))))
+def collect(gcda_paths, *,
+        sources=None,
+        jobs=None,
+        **args):
+    # automatic job detection?
+    if jobs == 0:
+        jobs = len(os.sched_getaffinity(0))
+
+    # resolve these once, note this needs to be hashable for find_source
+    if sources is not None:
+        sources = frozenset(os.path.abspath(s) for s in sources)
+
+    # merge duplicate lines as we go, gcov reports shared sources (headers
+    # especially) for every gcda file, so this keeps what we hand to fold
+    # small, note dicts preserve order so this doesn't change what fold sees
+    results = {}
+    def merge(results_):
+        if results_ is None:
+            sys.exit(-1)
+        for r in results_:
+            name = (r.file, r.function, r.line)
+            if name in results:
+                results[name] = results[name] + r
+            else:
+                results[name] = r
+
+    # each gcda file is independent, so running gcov is surprisingly
+    # parallelizable, note we use imap to keep our results deterministic
+    if jobs is not None:
+        with mp.Pool(jobs) as p:
+            for results_ in p.imap(
+                    starapply,
+                    ((collect_job, (path,), {'sources': sources, **args})
+                        for path in gcda_paths)):
+                merge(results_)
+    else:
+        for path in gcda_paths:
+            merge(collect_job(path, sources=sources, **args))
 
-    return results
+    return list(results.values())
 
 
 def fold(Result, results, *,
@@ -318,12 +396,12 @@ def fold(Result, results, *,
         results = results_
 
     # organize results into conflicts
-    folding = co.OrderedDict()
+    #
+    # note attrgetter fetches all of our keys in one call, this loop is hot
+    name = op.attrgetter(*by) if by else lambda _: ()
+    folding = co.defaultdict(list)
     for r in results:
-        name = tuple(getattr(r, k) for k in by)
-        if name not in folding:
-            folding[name] = []
-        folding[name].append(r)
+        folding[name(r)].append(r)
 
     # merge conflicts
     folded = []
@@ -353,24 +431,32 @@ def table(Result, results, diff_results=None, *,
     if diff_results is not None:
         diff_results = fold(Result, diff_results, by=by)
 
-    # organize by name
-    table = {
-        ','.join(str(getattr(r, k) or '') for k in by): r
-        for r in results}
-    diff_table = {
-        ','.join(str(getattr(r, k) or '') for k in by): r
-        for r in diff_results or []}
+    # organize by name, and find the totals while we're at it
+    table = {}
+    total = None
+    for r in results:
+        table[','.join(str(getattr(r, k) or '') for k in by)] = r
+        total = r if total is None else total + r
+    diff_table = {}
+    diff_total = None
+    for r in diff_results or []:
+        diff_table[','.join(str(getattr(r, k) or '') for k in by)] = r
+        diff_total = r if diff_total is None else diff_total + r
     names = list(table.keys() | diff_table.keys())
 
+    # find ratios once, these are needed for both sorting and filtering
+    if diff_results is not None:
+        ratios_ = {
+            n: [types[k].ratio(
+                    getattr(table.get(n), k, None),
+                    getattr(diff_table.get(n), k, None))
+                for k in fields]
+            for n in names}
+
     # sort again, now with diff info, note that python's sort is stable
     names.sort()
     if diff_results is not None:
-        names.sort(key=lambda n: tuple(
-            types[k].ratio(
-                getattr(table.get(n), k, None),
-                getattr(diff_table.get(n), k, None))
-            for k in fields),
-            reverse=True)
+        names.sort(key=lambda n: tuple(ratios_[n]), reverse=True)
     if sort:
         for k, reverse in reversed(sort):
             names.sort(
@@ -463,22 +549,18 @@ def table(Result, results, diff_results=None, *,
                 ratios = None
             else:
                 diff_r = diff_table.get(name)
-                ratios = [
-                    types[k].ratio(
-                        getattr(r, k, None),
-                        getattr(diff_r, k, None))
-                    for k in fields]
+                ratios = ratios_[name]
                 if not all_ and not any(ratios):
                     continue
             lines.append(table_entry(name, r, diff_r, ratios))
 
     # total
-    r = next(iter(fold(Result, results, by=[])), None)
+    r = total
     if diff_results is None:
         diff_r = None
         ratios = None
     else:
-        diff_r = next(iter(fold(Result, diff_results, by=[])), None)
+        diff_r = diff_total
         ratios = [
             types[k].ratio(
                 getattr(r, k, None),
@@ -494,13 +576,14 @@ def table(Result, results, diff_results=None, *,
             it.chain([23], it.repeat(7)),
             range(len(lines[0])-1))]
 
-    # print our table
-    for line in lines:
-        print('%-*s  %s%s' % (
-            widths[0], line[0],
-            ' '.join('%*s' % (w, x)
-                for w, x in zip(widths[1:], line[1:-1])),
-            line[-1]))
+    # our widths are fixed now, so build our row format once instead of
+    # reformatting every cell with dynamic widths
+    fmt = '%%-%ds  %s%%s\n' % (
+        widths[0],
+        ' '.join('%%%ds' % w for w in widths[1:]))
+
+    # print our table, building it up first so we only need one write
+    sys.stdout.write(''.join(fmt % tuple(line) for line in lines))
 
 
 def annotate(Result, results, *,
@@ -512,11 +595,13 @@ def annotate(Result, results, *,
     if annotate and not lines and not branches:
         lines, branches = True, True
 
-    for path in co.OrderedDict.fromkeys(r.file for r in results).keys():
-        # flatten to line info
-        results = fold(Result, results, by=['file', 'line'])
-        table = {r.line: r for r in results if r.file == path}
+    # flatten to line info, grouped by file, note we only need to do this
+    # once for all files
+    tables = co.defaultdict(dict)
+    for r in fold(Result, results, by=['file', 'line']):
+        tables[r.file][r.line] = r
 
+    for path, table in tables.items():
         # calculate spans to show
         if not annotate:
             spans = []
@@ -541,11 +626,17 @@ def annotate(Result, results, *,
 
         with open(path) as f:
             skipped = False
+            # spans are sorted and disjoint, so we can walk them alongside
+            # the source instead of searching every span for every line
+            j = 0
             for i, line in enumerate(f):
                 # skip lines not in spans?
-                if not annotate and not any(i+1 in s for s, _ in spans):
-                    skipped = True
-                    continue
+                if not annotate:
+                    while j < len(spans) and spans[j][0].stop <= i+1:
+                        j += 1
+                    if j >= len(spans) or i+1 not in spans[j][0]:
+                        skipped = True
+                        continue
 
                 if skipped:
                     skipped = False
@@ -553,7 +644,7 @@ def annotate(Result, results, *,
                         '\x1b[36m' if args['color'] else '',
                         path,
                         i+1,
-                        next(iter(f for _, f in spans)),
+                        spans[j][1],
                         '\x1b[m' if args['color'] else ''))
 
                 # build line
@@ -599,19 +690,24 @@ def main(gcda_paths, *,
     else:
         results = []
         with openio(args['use']) as f:
-            reader = csv.DictReader(f, restval='')
-            for r in reader:
-                if not any('cov_'+k in r and r['cov_'+k].strip()
-                        for k in CovResult._fields):
+            reader = csv.reader(f)
+            # map our fields to columns once, rather than building a dict for
+            # every row
+            header = {k: i for i, k in enumerate(next(reader, []))}
+            by_ = [(k, header[k])
+                for k in CovResult._by
+                if k in header]
+            fields_ = [(k, header['cov_'+k])
+                for k in CovResult._fields
+                if 'cov_'+k in header]
+            for row in reader:
+                if not any(i < len(row) and row[i].strip()
+                        for _, i in fields_):
                     continue
                 try:
-                    results.append(CovResult(
-                        **{k: r[k] for k in CovResult._by
-                            if k in r and r[k].strip()},
-                        **{k: r['cov_'+k]
-                            for k in CovResult._fields
-                            if 'cov_'+k in r
-                                and r['cov_'+k].strip()}))
+                    results.append(CovResult(**{
+                        k: row[i] for k, i in it.chain(by_, fields_)
+                        if i < len(row) and row[i].strip()}))
                 except TypeError:
                     pass
 
@@ -630,37 +726,36 @@ def main(gcda_paths, *,
 
     # write results to CSV
     if args.get('output'):
+        by_ = by if by is not None else CovResult._by
+        fields_ = fields if fields is not None else CovResult._fields
         with openio(args['output'], 'w') as f:
-            writer = csv.DictWriter(f,
-                (by if by is not None else CovResult._by)
-                + ['cov_'+k for k in (
-                    fields if fields is not None else CovResult._fields)])
-            writer.writeheader()
-            for r in results:
-                writer.writerow(
-                    {k: getattr(r, k) for k in (
-                        by if by is not None else CovResult._by)}
-                    | {'cov_'+k: getattr(r, k) for k in (
-                        fields if fields is not None else CovResult._fields)})
+            writer = csv.writer(f)
+            writer.writerow(by_ + ['cov_'+k for k in fields_])
+            writer.writerows(
+                [getattr(r, k) for k in it.chain(by_, fields_)]
+                for r in results)
 
     # find previous results?
     if args.get('diff'):
         diff_results = []
         try:
             with openio(args['diff']) as f:
-                reader = csv.DictReader(f, restval='')
-                for r in reader:
-                    if not any('cov_'+k in r and r['cov_'+k].strip()
-                            for k in CovResult._fields):
+                reader = csv.reader(f)
+                header = {k: i for i, k in enumerate(next(reader, []))}
+                by_ = [(k, header[k])
+                    for k in CovResult._by
+                    if k in header]
+                fields_ = [(k, header['cov_'+k])
+                    for k in CovResult._fields
+                    if 'cov_'+k in header]
+                for row in reader:
+                    if not any(i < len(row) and row[i].strip()
+                            for _, i in fields_):
                         continue
                     try:
-                        diff_results.append(CovResult(
-                            **{k: r[k] for k in CovResult._by
-                                if k in r and r[k].strip()},
-                            **{k: r['cov_'+k]
-                                for k in CovResult._fields
-                                if 'cov_'+k in r
-                                    and r['cov_'+k].strip()}))
+                        diff_results.append(CovResult(**{
+                            k: row[i] for k, i in it.chain(by_, fields_)
+                            if i < len(row) and row[i].strip()}))
                     except TypeError:
                         pass
         except FileNotFoundError:
@@ -699,7 +794,6 @@ def main(gcda_paths, *,
 
 if __name__ == "__main__":
     import argparse
-    import sys
     parser = argparse.ArgumentParser(
         description="Find coverage info after running tests.",
         allow_abbrev=False)
@@ -817,6 +911,12 @@ if __name__ == "__main__":
         '-E', '--error-on-branches',
         action='store_true',
         help="Error if any branches are not covered.")
+    parser.add_argument(
+        '-j', '--jobs',
+        nargs='?',
+        type=lambda x: int(x, 0),
+        const=0,
+        help="Number of processes to use. 0 spawns one process per core.")
     parser.add_argument(
         '--gcov-path',
         default=GCOV_PATH,
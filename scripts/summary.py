@@ -15,19 +15,32 @@
 import collections as co
 import csv
 import functools as ft
+import hashlib
 import itertools as it
 import math as m
+import multiprocessing as mp
+import operator as op
 import os
+import pickle
 import re
 
 
+# spellings of infinity we accept, with an optional sign
+INF_LITERALS = frozenset(['∞', 'inf'])
+
+# pattern for plain decimal ints, these are by far the most common values we
+# see when guessing types, note this needs to be a subset of what Int and
+# Float accept, so stick to ASCII whitespace and stay well under Python's
+# int-parsing digit limit
+INT_PATTERN = re.compile(r'^\s*[+-]?(?:0|[1-9][0-9]{0,17})\s*$', re.ASCII)
+
 # supported merge operations
 #
 # this is a terrible way to express these
 #
 OPS = {
-    'sum':     lambda xs: sum(xs[1:], start=xs[0]),
-    'prod':    lambda xs: m.prod(xs[1:], start=xs[0]),
+    'sum':     lambda xs: xs[0].sum(xs[1:]),
+    'prod':    lambda xs: xs[0].prod(xs[1:]),
     'min':     min,
     'max':     max,
     'mean':    lambda xs: Float(sum(float(x) for x in xs) / len(xs)),
@@ -44,6 +57,18 @@ OPS = {
 }
 
 
+# parse +-∞ and +-inf, returns None if x isn't infinite, this is checked for
+# every non-number we parse so we avoid regexes here
+def parse_inf(x):
+    x = x.strip()
+    sign = x[:1]
+    if sign in ('+', '-'):
+        x = x[1:].lstrip()
+    if x in INF_LITERALS:
+        return -m.inf if sign == '-' else m.inf
+    else:
+        return None
+
 # integer fields
 class Int(co.namedtuple('Int', 'x')):
     __slots__ = ()
@@ -55,11 +80,8 @@ class Int(co.namedtuple('Int', 'x')):
                 x = int(x, 0)
             except ValueError:
                 # also accept +-∞ and +-inf
-                if re.match('^\s*\+?\s*(?:∞|inf)\s*$', x):
-                    x = m.inf
-                elif re.match('^\s*-\s*(?:∞|inf)\s*$', x):
-                    x = -m.inf
-                else:
+                x = parse_inf(x)
+                if x is None:
                     raise
         assert isinstance(x, int) or m.isinf(x), x
         return super().__new__(cls, x)
@@ -122,6 +144,15 @@ class Int(co.namedtuple('Int', 'x')):
     def __mul__(self, other):
         return self.__class__(self.x * other.x)
 
+    # add/multiply many at once, this avoids creating an Int for every
+    # intermediate result
+    def sum(self, others):
+        return self.__class__(sum((other.x for other in others), self.x))
+
+    def prod(self, others):
+        return self.__class__(
+            m.prod((other.x for other in others), start=self.x))
+
 # float fields
 class Float(co.namedtuple('Float', 'x')):
     __slots__ = ()
@@ -133,11 +164,8 @@ class Float(co.namedtuple('Float', 'x')):
                 x = float(x)
             except ValueError:
                 # also accept +-∞ and +-inf
-                if re.match('^\s*\+?\s*(?:∞|inf)\s*$', x):
-                    x = m.inf
-                elif re.match('^\s*-\s*(?:∞|inf)\s*$', x):
-                    x = -m.inf
-                else:
+                x = parse_inf(x)
+                if x is None:
                     raise
         assert isinstance(x, float), x
         return super().__new__(cls, x)
@@ -162,6 +190,13 @@ class Float(co.namedtuple('Float', 'x')):
     __add__ = Int.__add__
     __sub__ = Int.__sub__
     __mul__ = Int.__mul__
+    prod = Int.prod
+
+    # note builtin sum uses compensated summation for floats in Python 3.12+,
+    # so reduce to keep the same left-to-right rounding as __add__
+    def sum(self, others):
+        return self.__class__(
+            ft.reduce(op.add, (other.x for other in others), self.x))
 
 # fractional fields, a/b
 class Frac(co.namedtuple('Frac', 'a,b')):
@@ -217,10 +252,30 @@ class Frac(co.namedtuple('Frac', 'a,b')):
     def __mul__(self, other):
         return self.__class__(self.a * other.a, self.b + other.b)
 
+    def sum(self, others):
+        return self.__class__(
+            self.a.sum(other.a for other in others),
+            self.b.sum(other.b for other in others))
+
+    def prod(self, others):
+        return self.__class__(
+            self.a.prod(other.a for other in others),
+            self.b.sum(other.b for other in others))
+
     def __lt__(self, other):
-        self_t = self.a.x/self.b.x if self.b.x else 1.0
-        other_t = other.a.x/other.b.x if other.b.x else 1.0
-        return (self_t, self.a.x) < (other_t, other.a.x)
+        self_a, self_b = self.a.x, self.b.x
+        other_a, other_b = other.a.x, other.b.x
+        # cross-multiply when we can, this is exact and avoids float
+        # division, which adds up when sorting, but only works for finite
+        # positive denominators
+        if (type(self_b) is int and self_b > 0
+                and type(other_b) is int and other_b > 0):
+            return ((self_a*other_b, self_a)
+                < (other_a*self_b, other_a))
+
+        self_t = self_a/self_b if self_b else 1.0
+        other_t = other_a/other_b if other_b else 1.0
+        return (self_t, self_a) < (other_t, other_a)
 
     def __gt__(self, other):
         return self.__class__.__lt__(other, self)
@@ -238,6 +293,9 @@ TYPES = co.OrderedDict([
     ('frac',  Frac)
 ])
 
+# types that accept plain decimal ints, note Frac needs an explicit a/b
+INT_TYPES = frozenset([Int, Float])
+
 
 def infer(results, *,
         by=None,
@@ -246,46 +304,59 @@ def infer(results, *,
         ops={},
         renames=[],
         **_):
-    # if fields not specified, try to guess from data
-    if fields is None:
-        fields = co.OrderedDict()
+    # find all keys and, if fields not specified, which types each field's
+    # values parse as, note we do this in one pass over the data
+    keys = {}
+    candidates = {}
+    if fields is None or by is None:
         for r in results:
             for k, v in r.items():
-                if (by is None or k not in by) and v.strip():
+                keys[k] = None
+                if (fields is None
+                        and (by is None or k not in by)
+                        and v.strip()):
+                    # plain decimal ints are common, and we know which
+                    # types accept them, so skip the try/excepts
+                    if INT_PATTERN.match(v):
+                        candidates[k] = [t
+                            for t in candidates.get(k, TYPES.values())
+                            if t in INT_TYPES]
+                        continue
+
                     types_ = []
-                    for t in fields.get(k, TYPES.values()):
+                    for t in candidates.get(k, TYPES.values()):
                         try:
                             t(v)
                             types_.append(t)
                         except ValueError:
                             pass
-                    fields[k] = types_
-        fields = list(k for k, v in fields.items() if v)
+                    candidates[k] = types_
+
+    # if fields not specified, guess it's anything that parses as a type
+    if fields is None:
+        fields = list(k for k, v in candidates.items() if v)
 
     # deduplicate fields
-    fields = list(co.OrderedDict.fromkeys(fields).keys())
+    fields = list(dict.fromkeys(fields))
 
     # if by not specified, guess it's anything not in fields and not a
     # source of a rename
     if by is None:
-        by = co.OrderedDict()
-        for r in results:
-            # also ignore None keys, these are introduced by csv.DictReader
-            # when header + row mismatch
-            by.update((k, True) for k in r.keys()
-                if k is not None
-                    and k not in fields
-                    and not any(k == old_k for _, old_k in renames))
-        by = list(by.keys())
+        renamed = {old_k for _, old_k in renames}
+        by = [k for k in keys if k not in fields and k not in renamed]
 
     # deduplicate fields
-    by = list(co.OrderedDict.fromkeys(by).keys())
+    by = list(dict.fromkeys(by))
 
     # find best type for all fields
     types_ = {}
     for k in fields:
         if k in types:
             types_[k] = types[k]
+        # already found while guessing fields? candidates are in TYPES order
+        # and only contain types that parse every value, so take the first
+        elif candidates.get(k):
+            types_[k] = candidates[k][0]
         else:
             for t in TYPES.values():
                 for r in results:
@@ -307,22 +378,46 @@ def infer(results, *,
     for k, t in types.items():
         types_[k] = ops.get(k, OPS['sum'])([t()]).__class__
 
+    # columns tend to repeat the same values, and our types are immutable,
+    # so only parse each distinct value once per field
+    parsers = {k: ft.lru_cache(maxsize=None)(t) for k, t in types.items()}
 
     # create result class
     def __new__(cls, **r):
         return cls.__mro__[1].__new__(cls,
             **{k: r.get(k, '') for k in by},
             **{k: r[k] if k in r and isinstance(r[k], list)
-                else [types[k](r[k])] if k in r
+                else [parsers[k](r[k])] if k in r
                 else []
                 for k in fields})
 
+    # note indexing skips __getattribute__, so self[i] gives us the raw
+    # field lists, and building positionally with tuple.__new__ skips the
+    # kwargs dicts __new__ needs
+
     def __add__(self, other):
-        return self.__class__(
-            **{k: getattr(self, k) for k in by},
-            **{k: object.__getattribute__(self, k)
-                + object.__getattribute__(other, k)
-                for k in fields})
+        return tuple.__new__(self.__class__, (
+            *self[:len(by)],
+            *(self[i] + other[i]
+                for i in range(len(by), len(by)+len(fields)))))
+
+    def _merge(cls, rs):
+        # merge many results at once, repeated __add__s would copy each
+        # field's values once per result
+        return tuple.__new__(cls, (
+            *rs[0][:len(by)],
+            *([v for r in rs for v in r[i]]
+                for i in range(len(by), len(by)+len(fields)))))
+
+    def _parse(cls, r):
+        # parse a raw CSV row, returns None if the row has no fields
+        fields_ = [[parsers[k](r[k])] if k in r and r[k].strip() else []
+            for k in fields]
+        if not any(fields_):
+            return None
+        return tuple.__new__(cls, (
+            *(r[k] if k in r and r[k].strip() else '' for k in by),
+            *fields_))
 
     def __getattribute__(self, k):
         if k in fields:
@@ -336,6 +431,8 @@ def infer(results, *,
         '__slots__': (),
         '__new__': __new__,
         '__add__': __add__,
+        '_merge': classmethod(_merge),
+        '_parse': classmethod(_parse),
         '__getattribute__': __getattribute__,
         '_by': by,
         '_fields': fields,
@@ -365,17 +462,15 @@ def fold(Result, results, *,
         results = results_
 
     # organize results into conflicts
-    folding = co.OrderedDict()
+    name = op.attrgetter(*by) if by else lambda _: ()
+    folding = co.defaultdict(list)
     for r in results:
-        name = tuple(getattr(r, k) for k in by)
-        if name not in folding:
-            folding[name] = []
-        folding[name].append(r)
+        folding[name(r)].append(r)
 
     # merge conflicts
     folded = []
     for name, rs in folding.items():
-        folded.append(sum(rs[1:], start=rs[0]))
+        folded.append(Result._merge(rs))
 
     return folded
 
@@ -394,6 +489,8 @@ def table(Result, results, diff_results=None, *,
     if fields is None:
         fields = Result._fields
     types = Result._types
+    # default sort order, find this once instead of once per name
+    sort_fields = [k for k in Result._sort if k in fields]
 
     # fold again
     results = fold(Result, results, by=by)
@@ -407,25 +504,33 @@ def table(Result, results, diff_results=None, *,
     diff_table = {
         ','.join(str(getattr(r, k) or '') for k in by): r
         for r in diff_results or []}
-    names = list(table.keys() | diff_table.keys())
+    # names in table are already unique, so only merge if we need to
+    if diff_results is not None:
+        names = list({**table, **diff_table})
+    else:
+        names = list(table)
+
+    # find ratios once, these are needed for both sorting and filtering
+    if diff_results is not None:
+        ratios_ = {
+            n: [types[k].ratio(
+                    getattr(table.get(n), k, None),
+                    getattr(diff_table.get(n), k, None))
+                for k in fields]
+            for n in names}
 
     # sort again, now with diff info, note that python's sort is stable
     names.sort()
     if diff_results is not None:
-        names.sort(key=lambda n: tuple(
-            types[k].ratio(
-                getattr(table.get(n), k, None),
-                getattr(diff_table.get(n), k, None))
-            for k in fields),
-            reverse=True)
+        names.sort(key=lambda n: tuple(ratios_[n]), reverse=True)
     if sort:
         for k, reverse in reversed(sort):
             names.sort(
                 key=lambda n: tuple(
-                    (getattr(table[n], k),)
-                    if getattr(table.get(n), k, None) is not None else ()
-                    for k in ([k] if k else [
-                        k for k in Result._sort if k in fields])),
+                    (v,) if v is not None else ()
+                    for v in (
+                        getattr(table.get(n), k, None)
+                        for k in ([k] if k else sort_fields))),
                 reverse=reverse ^ (not k or k in Result._fields))
 
 
@@ -457,32 +562,40 @@ def table(Result, results, diff_results=None, *,
     header.append('')
     lines.append(header)
 
+    # our fields and types are fixed for the whole table, so find how to
+    # access all fields at once and what to show for missing fields once,
+    # note attrgetter returns a bare value for a single field
+    getvs = (op.attrgetter(*fields) if len(fields) > 1
+        else (lambda r: (getattr(r, fields[0]),)) if fields
+        else (lambda r: ()))
+    nonevs = (None,)*len(fields)
+    nones = [types[k].none for k in fields]
+    diff_nones = [types[k].diff_none for k in fields]
+    diff_diffs = [types[k].diff_diff for k in fields]
+
     def table_entry(name, r, diff_r=None, ratios=[]):
+        # note our fields are lazy and recomputed on every access, so only
+        # access them once
+        vs = getvs(r) if r is not None else nonevs
+        diff_vs = getvs(diff_r) if diff_r is not None else nonevs
+
         entry = []
         entry.append(name)
         if diff_results is None:
-            for k in fields:
-                entry.append(getattr(r, k).table()
-                    if getattr(r, k, None) is not None
-                    else types[k].none)
+            for v, none in zip(vs, nones):
+                entry.append(v.table() if v is not None else none)
         elif percent:
-            for k in fields:
-                entry.append(getattr(r, k).diff_table()
-                    if getattr(r, k, None) is not None
-                    else types[k].diff_none)
+            for v, none in zip(vs, diff_nones):
+                entry.append(v.diff_table() if v is not None else none)
         else:
-            for k in fields:
-                entry.append(getattr(diff_r, k).diff_table()
-                    if getattr(diff_r, k, None) is not None
-                    else types[k].diff_none)
-            for k in fields:
-                entry.append(getattr(r, k).diff_table()
-                    if getattr(r, k, None) is not None
-                    else types[k].diff_none)
-            for k in fields:
-                entry.append(types[k].diff_diff(
-                        getattr(r, k, None),
-                        getattr(diff_r, k, None)))
+            for diff_v, none in zip(diff_vs, diff_nones):
+                entry.append(diff_v.diff_table()
+                    if diff_v is not None
+                    else none)
+            for v, none in zip(vs, diff_nones):
+                entry.append(v.diff_table() if v is not None else none)
+            for v, diff_v, diff_diff in zip(vs, diff_vs, diff_diffs):
+                entry.append(diff_diff(v, diff_v))
         if diff_results is None:
             entry.append('')
         elif percent:
@@ -510,11 +623,7 @@ def table(Result, results, diff_results=None, *,
                 ratios = None
             else:
                 diff_r = diff_table.get(name)
-                ratios = [
-                    types[k].ratio(
-                        getattr(r, k, None),
-                        getattr(diff_r, k, None))
-                    for k in fields]
+                ratios = ratios_[name]
                 if not all_ and not any(ratios):
                     continue
             lines.append(table_entry(name, r, diff_r, ratios))
@@ -541,13 +650,14 @@ def table(Result, results, diff_results=None, *,
             it.chain([23], it.repeat(7)),
             range(len(lines[0])-1))]
 
-    # print our table
-    for line in lines:
-        print('%-*s  %s%s' % (
-            widths[0], line[0],
-            ' '.join('%*s' % (w, x)
-                for w, x in zip(widths[1:], line[1:-1])),
-            line[-1]))
+    # our widths are fixed now, so build our row format once instead of
+    # reformatting every cell with dynamic widths
+    fmt = '%%-%ds  %s%%s\n' % (
+        widths[0],
+        ' '.join('%%%ds' % w for w in widths[1:]))
+
+    # print our table, building it up first so we only need one write
+    sys.stdout.write(''.join(fmt % tuple(line) for line in lines))
 
 
 def openio(path, mode='r', buffering=-1):
@@ -560,11 +670,86 @@ def openio(path, mode='r', buffering=-1):
     else:
         return open(path, mode, buffering)
 
+def collect_csv(path, *,
+        renames=[],
+        cache=None):
+    # already parsed? we name our cache entries after the file's path and
+    # renames, since these are applied while parsing, and invalidate them
+    # if the file's mtime or size changes
+    #
+    # note we only cache regular files, pipes and such may reuse names
+    if cache is not None and path != '-' and os.path.isfile(path):
+        st = os.stat(path)
+        name = (os.path.realpath(path), tuple(renames))
+        key = (name, st.st_mtime_ns, st.st_size)
+        cache_path = os.path.join(cache, '%s.pickle'
+            % hashlib.sha1(repr(name).encode()).hexdigest())
+        # note a corrupt or foreign cache entry can fail in any number of
+        # ways, we just treat it as a miss
+        try:
+            with open(cache_path, 'rb') as f:
+                key_, results = pickle.load(f)
+            if key_ == key:
+                return results
+        except Exception:
+            pass
+
+        results = collect_csv(path, renames=renames)
+
+        # write to a temporary file first so concurrent runs never see a
+        # partial cache entry, note failing to write our cache isn't fatal
+        tmp_path = '%s.%d' % (cache_path, os.getpid())
+        try:
+            os.makedirs(cache, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, results), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return results
+
+    results = []
+    try:
+        with openio(path) as f:
+            # csv.reader + dict(zip) is a fair bit cheaper than
+            # csv.DictReader, note we still skip blank lines and pad short
+            # rows, but drop extra columns
+            reader = csv.reader(f)
+            header = next(reader, [])
+            for row in reader:
+                if not row:
+                    continue
+                r = dict(zip(header,
+                    row + ['']*(len(header)-len(row))))
+
+                # rename fields?
+                if renames:
+                    # make a copy so renames can overlap
+                    r_ = {}
+                    for new_k, old_k in renames:
+                        if old_k in r:
+                            r_[new_k] = r[old_k]
+                    r.update(r_)
+
+                results.append(r)
+    except FileNotFoundError:
+        pass
+
+    return results
+
+def starapply(args):
+    f, args, kwargs = args
+    return f(*args, **kwargs)
+
 def main(csv_paths, *,
         by=None,
         fields=None,
         defines=None,
         sort=None,
+        jobs=None,
         **args):
     # separate out renames
     renames = list(it.chain.from_iterable(
@@ -607,25 +792,48 @@ def main(csv_paths, *,
                 ops_[new_k] = ops[old_k]
         ops.update(ops_)
 
+    # automatic job detection?
+    if jobs == 0:
+        jobs = len(os.sched_getaffinity(0))
+
     # find CSV files
+    #
+    # the same CSV may be passed multiple times, its rows still count each
+    # time, but we only need to parse it once, note we only use realpath to
+    # find duplicates, paths such as /dev/fd/N need to be opened as given
+    paths = {}
+    for path in csv_paths:
+        if path != '-':
+            paths.setdefault(os.path.realpath(path), path)
+
+    # each CSV file is independent, so parsing is easily parallelizable,
+    # note we use imap to keep our results deterministic
+    #
+    # only regular files go to our workers, stdin, pipes, etc can't be
+    # safely shared with other processes
+    parsed = {}
+    if jobs is not None:
+        files = {path_: path for path_, path in paths.items()
+            if os.path.isfile(path)}
+        with mp.Pool(jobs) as p:
+            parsed.update(zip(files, p.imap(
+                starapply,
+                ((collect_csv, (path,), {
+                        'renames': renames,
+                        'cache': args.get('cache')})
+                    for path in files.values()))))
+    for path_, path in paths.items():
+        if path_ not in parsed:
+            parsed[path_] = collect_csv(path,
+                renames=renames,
+                cache=args.get('cache'))
+
     results = []
     for path in csv_paths:
-        try:
-            with openio(path) as f:
-                reader = csv.DictReader(f, restval='')
-                for r in reader:
-                    # rename fields?
-                    if renames:
-                        # make a copy so renames can overlap
-                        r_ = {}
-                        for new_k, old_k in renames:
-                            if old_k in r:
-                                r_[new_k] = r[old_k]
-                        r.update(r_)
-
-                    results.append(r)
-        except FileNotFoundError:
-            pass
+        if path == '-':
+            results.extend(collect_csv(path, renames=renames))
+        else:
+            results.extend(parsed[os.path.realpath(path)])
 
     # homogenize
     Result = infer(results,
@@ -636,15 +844,9 @@ def main(csv_paths, *,
         renames=renames)
     results_ = []
     for r in results:
-        if not any(k in r and r[k].strip()
-                for k in Result._fields):
-            continue
-        try:
-            results_.append(Result(**{
-                k: r[k] for k in Result._by + Result._fields
-                if k in r and r[k].strip()}))
-        except TypeError:
-            pass
+        r = Result._parse(r)
+        if r is not None:
+            results_.append(r)
     results = results_
 
     # fold
@@ -656,47 +858,44 @@ def main(csv_paths, *,
         for k, reverse in reversed(sort):
             results.sort(
                 key=lambda r: tuple(
-                    (getattr(r, k),) if getattr(r, k) is not None else ()
-                    for k in ([k] if k else Result._sort)),
+                    (v,) if v is not None else ()
+                    for v in (
+                        getattr(r, k)
+                        for k in ([k] if k else Result._sort))),
                 reverse=reverse ^ (not k or k in Result._fields))
 
     # write results to CSV
     if args.get('output'):
         with openio(args['output'], 'w') as f:
-            writer = csv.DictWriter(f, Result._by + Result._fields)
-            writer.writeheader()
-            for r in results:
-                # note we need to go through getattr to resolve lazy fields
-                writer.writerow({
-                    k: getattr(r, k) for k in Result._by + Result._fields})
+            # csv.writer + writerows is a fair bit cheaper than
+            # csv.DictWriter, note we still need to go through getattr to
+            # resolve lazy fields
+            keys = Result._by + Result._fields
+            writer = csv.writer(f)
+            writer.writerow(keys)
+            writer.writerows(
+                [getattr(r, k) for k in keys] for r in results)
 
     # find previous results?
     if args.get('diff'):
+        # reuse our parsed CSV if the diff is also an input, unless we just
+        # overwrote it with -o
+        path = os.path.realpath(args['diff']) if args['diff'] != '-' else None
+        if (path in parsed
+                and not (args.get('output')
+                    and args['output'] != '-'
+                    and os.path.realpath(args['output']) == path)):
+            diff_results_ = parsed[path]
+        else:
+            diff_results_ = collect_csv(args['diff'],
+                renames=renames,
+                cache=args.get('cache'))
+
         diff_results = []
-        try:
-            with openio(args['diff']) as f:
-                reader = csv.DictReader(f, restval='')
-                for r in reader:
-                    # rename fields?
-                    if renames:
-                        # make a copy so renames can overlap
-                        r_ = {}
-                        for new_k, old_k in renames:
-                            if old_k in r:
-                                r_[new_k] = r[old_k]
-                        r.update(r_)
-
-                    if not any(k in r and r[k].strip()
-                            for k in Result._fields):
-                        continue
-                    try:
-                        diff_results.append(Result(**{
-                            k: r[k] for k in Result._by + Result._fields
-                            if k in r and r[k].strip()}))
-                    except TypeError:
-                        pass
-        except FileNotFoundError:
-            pass
+        for r in diff_results_:
+            r = Result._parse(r)
+            if r is not None:
+                diff_results.append(r)
 
         # fold
         diff_results = fold(Result, diff_results, by=by, defines=defines)
@@ -731,6 +930,10 @@ if __name__ == "__main__":
     parser.add_argument(
         '-d', '--diff',
         help="Specify CSV file to diff against.")
+    parser.add_argument(
+        '--cache',
+        help="Cache parsed CSV files in this directory, useful when "
+            "summarizing the same CSV files repeatedly.")
     parser.add_argument(
         '-a', '--all',
         action='store_true',
@@ -824,6 +1027,13 @@ if __name__ == "__main__":
         '--gstddev',
         action='append',
         help="Find the geometric standard deviation of these fields.")
+    parser.add_argument(
+        '-j', '--jobs',
+        nargs='?',
+        type=lambda x: int(x, 0),
+        const=0,
+        help="Number of processes to use when parsing CSV files. 0 spawns "
+            "one process per core.")
     sys.exit(main(**{k: v
         for k, v in vars(parser.parse_intermixed_args()).items()
         if v is not None}))
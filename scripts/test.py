@@ -237,8 +237,7 @@ def compile(test_paths, **args):
         if os.path.isdir(path):
             path = path + '/*.toml'
 
-        for path in glob.glob(path):
-            paths.append(path)
+        paths.extend(glob.glob(path))
 
     if not paths:
         print('no test suites found in %r?' % test_paths)